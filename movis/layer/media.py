@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import io
+import math
+import os
 from os import PathLike
 from pathlib import Path
-from typing import Sequence
+import subprocess
+import tempfile
+from typing import Any, Iterator, Sequence, cast
 import warnings
+import weakref
 
-import imageio
+import imageio_ffmpeg
 import librosa
 import numpy as np
 from PIL import Image as PILImage
@@ -14,57 +22,349 @@ from ..util import to_rgb
 from .mixin import TimelineMixin
 from .protocol import AUDIO_SAMPLING_RATE
 
+try:
+    import av
+    av_available = True
+except ImportError:
+    av_available = False
+
+try:
+    from numba import njit
+    numba_available = True
+except ImportError:
+    numba_available = False
+
+try:
+    import pyvips
+    pyvips_available = True
+except (ImportError, OSError):
+    pyvips_available = False
+
+try:
+    from turbojpeg import TJPF_RGBA, TurboJPEG
+    _turbo_jpeg: TurboJPEG | None = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+# The maximum number of frames ``Video`` decodes forward before it prefers seeking to a keyframe.
+_GOP_LOOKAHEAD_FRAMES = 32
+# The maximum number of frames the ffmpeg fallback of ``Video`` reads through before restarting with a seek.
+_KEYFRAME_DIST_FRAMES = 64
+# File extensions that ``ImageSequence.from_dir`` treats as images.
+_IMG_EXTS = frozenset([".png", ".jpg", ".jpeg", ".bmp", ".tiff"])
+# The number of upcoming images ``ImageSequence`` decodes in the background.
+_PREFETCH_FRAMES = 4
+# The maximum gap between consecutive requests that ``ImageSequence`` follows when prefetching images.
+_MAX_PREFETCH_STRIDE = 16
+# Background image decoding shared by all ``ImageSequence`` layers.
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="movis-prefetch")
+# The memory budget in bytes for decoded images cached by ``ImageSequence``.
+_CACHE_BYTES = 256 * 1024 * 1024
+# The number of most recently used images that ``ImageSequence`` never compresses.
+_HOT_FRAMES = 2
+# Image files up to this size are read into memory with a single call before being decoded by Pillow.
+_READ_AHEAD_BYTES = 16 * 1024 * 1024
+# Decoded ``Image`` files at least this large are backed by a memory-mapped temporary file.
+_MMAP_MIN_BYTES = 4 * 1024 * 1024
+# Buffers that movis allocates for decoded images and video frames are aligned to this many bytes.
+_ALIGNMENT = 64
+
+
+def _empty_aligned(shape: tuple[int, ...]) -> np.ndarray:
+    """Allocate an uninitialized uint8 array whose data pointer is aligned to ``_ALIGNMENT`` bytes."""
+    n_bytes = int(np.prod(shape))
+    buf = np.empty(n_bytes + _ALIGNMENT, dtype=np.uint8)
+    offset = -buf.ctypes.data % _ALIGNMENT
+    return buf[offset:offset + n_bytes].reshape(shape)
+
+
+def _as_aligned_rgba(image: np.ndarray) -> np.ndarray:
+    """Return a C-contiguous copy of ``image`` aligned to ``_ALIGNMENT`` bytes, unless it already is."""
+    if image.flags.c_contiguous and image.ctypes.data % _ALIGNMENT == 0:
+        return image
+    aligned = _empty_aligned(image.shape)
+    aligned[...] = image
+    return aligned
+
+
+if numba_available:
+    @njit(cache=True)
+    def _gray_to_rgba_kernel(gray: np.ndarray, out: np.ndarray) -> None:
+        for y in range(gray.shape[0]):
+            for x in range(gray.shape[1]):
+                v = gray[y, x]
+                out[y, x, 0] = v
+                out[y, x, 1] = v
+                out[y, x, 2] = v
+                out[y, x, 3] = 255
+
+    @njit(cache=True)
+    def _rgb_to_rgba_kernel(rgb: np.ndarray, out: np.ndarray) -> None:
+        for y in range(rgb.shape[0]):
+            for x in range(rgb.shape[1]):
+                out[y, x, 0] = rgb[y, x, 0]
+                out[y, x, 1] = rgb[y, x, 1]
+                out[y, x, 2] = rgb[y, x, 2]
+                out[y, x, 3] = 255
+
+    @njit(cache=True)
+    def _premultiply_kernel(rgba: np.ndarray, out: np.ndarray) -> None:
+        for y in range(rgba.shape[0]):
+            for x in range(rgba.shape[1]):
+                a = np.uint16(rgba[y, x, 3])
+                out[y, x, 0] = (rgba[y, x, 0] * a + 127) // 255
+                out[y, x, 1] = (rgba[y, x, 1] * a + 127) // 255
+                out[y, x, 2] = (rgba[y, x, 2] * a + 127) // 255
+                out[y, x, 3] = a
+
+    @njit(cache=True)
+    def _palettize_kernel(pixels: np.ndarray, palette: np.ndarray, indices: np.ndarray) -> int:
+        # A single pass with an open-addressing hash table, which gives up at the 257th color.
+        keys = np.zeros(1024, dtype=np.uint32)
+        slots = np.full(1024, -1, dtype=np.int32)
+        n_color = 0
+        last_pixel = np.uint32(0)
+        last_index = -1
+        for i in range(pixels.shape[0]):
+            pixel = pixels[i]
+            if pixel != last_pixel or last_index < 0:
+                h = ((np.uint64(pixel) * np.uint64(2654435761)) >> np.uint64(22)) & np.uint64(1023)
+                while slots[h] >= 0 and keys[h] != pixel:
+                    h = (h + np.uint64(1)) & np.uint64(1023)
+                if slots[h] < 0:
+                    if n_color == 256:
+                        return -1
+                    keys[h] = pixel
+                    slots[h] = n_color
+                    palette[n_color] = pixel
+                    n_color += 1
+                last_pixel = pixel
+                last_index = slots[h]
+            indices[i] = last_index
+        return n_color
+
+
+def _gray_to_rgba(gray: np.ndarray) -> np.ndarray:
+    rgba = _empty_aligned(gray.shape + (4,))
+    if numba_available:
+        _gray_to_rgba_kernel(gray, rgba)
+    else:
+        rgba[:, :, :3] = gray[:, :, None]
+        rgba[:, :, 3] = 255
+    return rgba
+
+
+def _rgb_to_rgba(rgb: np.ndarray) -> np.ndarray:
+    rgba = _empty_aligned(rgb.shape[:2] + (4,))
+    if numba_available:
+        _rgb_to_rgba_kernel(rgb, rgba)
+    else:
+        rgba[:, :, :3] = rgb
+        rgba[:, :, 3] = 255
+    return rgba
+
+
+def _pil_to_rgba(img: PILImage.Image) -> np.ndarray:
+    # Avoid ``convert("RGBA")`` for the common modes, which allocates an intermediate image.
+    # A transparent color key (e.g., the tRNS chunk of PNG) is left to ``convert``, which turns it into alpha.
+    if img.mode == "RGBA":
+        return np.asarray(img)
+    elif img.mode == "RGB" and "transparency" not in img.info:
+        return _rgb_to_rgba(np.asarray(img))
+    elif img.mode == "L" and "transparency" not in img.info:
+        return _gray_to_rgba(np.asarray(img))
+    return np.asarray(img.convert("RGBA"))
+
+
+def _premultiply(rgba: np.ndarray) -> np.ndarray:
+    """Return a copy of ``rgba`` whose color channels are multiplied by its alpha channel."""
+    out = _empty_aligned(rgba.shape)
+    if numba_available:
+        _premultiply_kernel(rgba, out)
+    else:
+        alpha = rgba[:, :, 3:].astype(np.uint16)
+        out[:, :, :3] = (rgba[:, :, :3] * alpha + 127) // 255
+        out[:, :, 3] = rgba[:, :, 3]
+    return out
+
+
+def _read_image_file(img_file: str | PathLike, premultiplied: bool = False) -> np.ndarray:
+    image = _decode_image_file(img_file)
+    return _premultiply(image) if premultiplied else image
+
+
+def _decode_image_file(img_file: str | PathLike) -> np.ndarray:
+    if _turbo_jpeg is not None and Path(img_file).suffix.lower() in (".jpg", ".jpeg"):
+        with open(img_file, "rb") as f:
+            jpeg_buf = f.read()
+        try:
+            width, height, _, _ = _turbo_jpeg.decode_header(jpeg_buf)
+            rgba = _empty_aligned((height, width, 4))
+            try:
+                return _turbo_jpeg.decode(jpeg_buf, pixel_format=TJPF_RGBA, dst=rgba)
+            except TypeError:
+                # PyTurboJPEG older than 1.8.2 cannot decode into a given buffer.
+                return _as_aligned_rgba(_turbo_jpeg.decode(jpeg_buf, pixel_format=TJPF_RGBA))
+        except OSError:
+            # e.g., CMYK images cannot be converted to RGBA by libjpeg-turbo.
+            pass
+    if pyvips_available:
+        try:
+            vips_image = pyvips.Image.new_from_file(str(img_file), access="sequential")
+            # Other color spaces (e.g., CMYK) and images with more than 8 bits per channel are left to Pillow,
+            # which converts them to 8-bit RGB differently.
+            if vips_image.format == "uchar" and vips_image.interpretation in ("srgb", "b-w"):
+                if vips_image.interpretation == "b-w":
+                    vips_image = vips_image.colourspace("srgb")
+                if vips_image.bands == 3:
+                    vips_image = vips_image.bandjoin_const([255])
+                if vips_image.bands == 4:
+                    return vips_image.numpy()
+        except pyvips.Error:
+            pass
+    img_path = Path(img_file)
+    if img_path.stat().st_size <= _READ_AHEAD_BYTES:
+        with PILImage.open(io.BytesIO(img_path.read_bytes())) as img:
+            return _pil_to_rgba(img)
+    with open(img_path, "rb", buffering=1 << 20) as img_fp, PILImage.open(img_fp) as img:
+        return _pil_to_rgba(img)
+
+
+def _kill_process(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.kill()
+    if proc.stdout is not None:
+        proc.stdout.close()
+    proc.wait()
+
+
+def _cancel_futures(futures: dict[int, Future[np.ndarray]]) -> None:
+    for future in futures.values():
+        future.cancel()
+
+
+def _to_memmap(image: np.ndarray) -> np.memmap:
+    # The file is deleted when the memory map is closed (POSIX unlinks it immediately).
+    with tempfile.TemporaryFile(prefix="movis-", suffix=".rgba") as f:
+        f.write(np.ascontiguousarray(image).data)
+        f.flush()
+        return np.memmap(f, dtype=np.uint8, mode="r", shape=image.shape)
+
+
+class _PalettedImage:
+    """An RGBA image losslessly stored as a palette of at most 256 colors and a ``uint8`` index map."""
+
+    def __init__(self, palette: np.ndarray, indices: np.ndarray) -> None:
+        self.palette = palette
+        self.indices = indices
+
+    @property
+    def nbytes(self) -> int:
+        return self.palette.nbytes + self.indices.nbytes
+
+    @classmethod
+    def from_rgba(cls, image: np.ndarray) -> _PalettedImage | None:
+        """Return the paletted image, or ``None`` if ``image`` has more than 256 colors."""
+        pixels = np.ascontiguousarray(image).view(np.uint32).reshape(-1)
+        colors = np.empty(256, dtype=np.uint32)
+        indices = np.empty(pixels.shape, dtype=np.uint8)
+        n_color = _palettize_kernel(pixels, colors, indices)
+        if n_color < 0:
+            return None
+        palette = colors[:n_color].view(np.uint8).reshape(-1, 4)
+        return cls(palette, indices.reshape(image.shape[:2]))
+
+    def to_rgba(self) -> np.ndarray:
+        rgba = _empty_aligned(self.indices.shape + (4,))
+        np.take(self.palette, self.indices, axis=0, out=rgba)
+        return rgba
+
+
+class _DecodedImage:
+    """A weak-referenceable owner of a decoded image file shared by ``Image`` layers."""
+
+    __slots__ = ("array", "__weakref__")
+
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+
+
+# Decoded image files keyed by their resolved path, modification time, and whether alpha is premultiplied.
+_DECODED_CACHE: weakref.WeakValueDictionary[tuple[str, int, bool], _DecodedImage] = weakref.WeakValueDictionary()
+
+
+def _load_decoded_image(img_file: Path, premultiplied: bool) -> _DecodedImage:
+    img_path = img_file.resolve()
+    key = (str(img_path), img_path.stat().st_mtime_ns, premultiplied)
+    decoded = _DECODED_CACHE.get(key)
+    if decoded is None:
+        image = _read_image_file(img_path, premultiplied)
+        if image.nbytes >= _MMAP_MIN_BYTES:
+            image = _to_memmap(image)
+        else:
+            image.setflags(write=False)
+        decoded = _DecodedImage(image)
+        _DECODED_CACHE[key] = decoded
+    return decoded
+
 
 class Image:
     """Still image layer to encapsulate various formats of image data and offer
     time-based keying.
 
+    Image files are decoded on first use. Large decoded images are stored in a memory-mapped temporary file
+    so that the OS can page them out while the layer is not rendered.
+    ``Image`` layers created from the same file share a single read-only decoded array.
+
     Args:
         img_file: the source of the image data. It can be a file path (``str`` or ``PathLike``),
             a `PIL.Image` object, or a two or three-dimensional ``numpy.ndarray`` with a shape of ``(H, W, C)``.
         duration: the duration for which the image should be displayed.
             Default is ``1000000.0`` (long enough time).
+        premultiplied: if ``True``, the color channels are multiplied by the alpha channel when the image is loaded.
+            Note that movis itself composites images with straight (non-premultiplied) alpha. Default is ``False``.
     """
     def __init__(
         self,
         img_file: str | PathLike | PILImage.Image | np.ndarray,
-        duration: float = 1e6
+        duration: float = 1e6,
+        premultiplied: bool = False,
     ) -> None:
         self._image: np.ndarray | None = None
         self._img_file: Path | None = None
+        self._decoded: _DecodedImage | None = None
         if isinstance(img_file, (str, PathLike)):
             self._img_file = Path(img_file)
             assert self._img_file.exists(), f"{self._img_file} does not exist"
         elif isinstance(img_file, PILImage.Image):
-            image = np.asarray(img_file.convert("RGBA"))
-            self._image = image
+            self._image = _pil_to_rgba(img_file)
         elif isinstance(img_file, np.ndarray):
             assert img_file.dtype == np.uint8
             if img_file.ndim == 2:
-                img = img_file[:, :, None]
-                img = np.concatenate([
-                    np.repeat(img, 3, axis=-1),
-                    np.full_like(img, 255, dtype=np.uint8)],
-                    axis=-1)
-                self._image = img
+                self._image = _gray_to_rgba(img_file)
             elif img_file.ndim == 3:
                 if img_file.shape[2] == 3:
-                    img = np.concatenate([
-                        img_file,
-                        np.full_like(img_file[:, :, :1], 255, dtype=np.uint8)],
-                        axis=-1)
-                    self._image = img
+                    self._image = _rgb_to_rgba(img_file)
                 elif img_file.shape[2] == 4:
                     self._image = img_file
                 else:
                     raise ValueError(f"Invalid img_file shape: {img_file.shape}. Must be (H, W, 3) or (H, W, 4).")
-                assert img_file.shape[2] == 4, "Image must have 4 channels (RGBA)"
             else:
                 raise ValueError(f"Invalid img_file shape: {img_file.shape}")
         else:
             raise ValueError(f"Invalid img_file type: {type(img_file)}")
+        if premultiplied and self._image is not None:
+            self._image = _premultiply(self._image)
 
         self._duration = duration
+        self._premultiplied = premultiplied
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        if self._img_file is not None:
+            state['_image'] = None
+            state['_decoded'] = None
+        return state
 
     @property
     def image(self) -> np.ndarray | None:
@@ -105,17 +405,18 @@ class Image:
 
     def get_key(self, time: float) -> bool:
         """Get the state index for the given time."""
-        return 0 <= time < self.duration
+        # This is called for every frame, so the attribute is read directly instead of through the property.
+        return 0.0 <= time < self._duration
 
     def _read_image(self) -> np.ndarray:
         if self._image is None:
             assert self._img_file is not None
-            image = np.asarray(PILImage.open(self._img_file).convert("RGBA"))
-            self._image = image
+            self._decoded = _load_decoded_image(self._img_file, self._premultiplied)
+            self._image = self._decoded.array
         return self._image
 
     def __call__(self, time: float) -> np.ndarray | None:
-        if 0 <= time < self.duration:
+        if 0.0 <= time < self._duration:
             return self._read_image()
         return None
 
@@ -123,6 +424,13 @@ class Image:
 class ImageSequence(TimelineMixin):
     """Image sequence layer to encapsulate various formats of images.
 
+    Images given as file paths are decoded lazily. Once rendering starts, the next few images are decoded
+    in background threads, and decoded images are cached within a fixed memory budget.
+    When the budget is exceeded and Numba is installed, images that have not been used recently and consist
+    of at most 256 colors (e.g., mattes and UI graphics) are losslessly compressed to a palette
+    before older images are evicted.
+    JPEG files are decoded with libjpeg-turbo if ``PyTurboJPEG`` is installed.
+
     Args:
         start_times:
             a sequence of start times for each image.
@@ -131,13 +439,17 @@ class ImageSequence(TimelineMixin):
         img_files:
             a sequence of image data. Each element can be a file path (``str`` or ``Path``),
             a `PIL.Image` object, or a two or four-dimensional ``numpy.ndarray`` with a shape of ``(H, W, C)``.
+        premultiplied:
+            if ``True``, the color channels are multiplied by the alpha channel when each image is loaded.
+            Note that movis itself composites images with straight (non-premultiplied) alpha. Default is ``False``.
     """
 
     @classmethod
     def from_files(
         cls,
         img_files: Sequence[str | PathLike | PILImage.Image | np.ndarray],
-        each_duration: float = 1.0
+        each_duration: float = 1.0,
+        premultiplied: bool = False,
     ) -> "ImageSequence":
         """Create an ``ImageSequence`` object from a sequence of image files.
 
@@ -150,19 +462,26 @@ class ImageSequence(TimelineMixin):
                 a `PIL.Image` object, or a two or four-dimensional ``numpy.ndarray`` with a shape of ``(H, W, C)``.
             each_duration:
                 the duration for which each image should be displayed. Default is ``1.0``.
+            premultiplied:
+                if ``True``, the color channels are multiplied by the alpha channel when each image is loaded.
+                Default is ``False``.
 
         Returns:
             An ``ImageSequence`` object.
         """
         start_times = np.arange(len(img_files)) * each_duration
         end_times = start_times + each_duration
-        return cls(start_times.tolist(), end_times.tolist(), img_files)
+        layer = cls(start_times.tolist(), end_times.tolist(), img_files, premultiplied=premultiplied)
+        if each_duration > 0:
+            layer._each_duration = each_duration
+        return layer
 
     @classmethod
     def from_dir(
         cls,
         img_dir: str | PathLike,
-        each_duration: float = 1.0
+        each_duration: float = 1.0,
+        premultiplied: bool = False,
     ) -> "ImageSequence":
         """Create an ``ImageSequence`` object from a directory of image files.
 
@@ -171,21 +490,25 @@ class ImageSequence(TimelineMixin):
                 a directory containing image files.
             each_duration:
                 the duration for which each image should be displayed. Default is ``1.0``.
+            premultiplied:
+                if ``True``, the color channels are multiplied by the alpha channel when each image is loaded.
+                Default is ``False``.
 
         Returns:
             An ``ImageSequence`` object.
         """
-        img_dir = Path(img_dir)
-        exts = set([".png", ".jpg", ".jpeg", ".bmp", ".tiff"])
-        img_files = [
-            p for p in sorted(img_dir.glob("*")) if p.is_file() and p.suffix in exts]
-        return cls.from_files(img_files, each_duration)
+        with os.scandir(os.fspath(img_dir)) as entries:
+            img_files = sorted(
+                Path(e.path) for e in entries
+                if os.path.splitext(e.name)[1].lower() in _IMG_EXTS and e.is_file())
+        return cls.from_files(img_files, each_duration, premultiplied=premultiplied)
 
     def __init__(
         self,
         start_times: Sequence[float],
         end_times: Sequence[float],
-        img_files: Sequence[str | PathLike | PILImage.Image | np.ndarray]
+        img_files: Sequence[str | PathLike | PILImage.Image | np.ndarray],
+        premultiplied: bool = False,
     ) -> None:
         super().__init__(start_times, end_times)
         self.img_files = img_files
@@ -195,59 +518,445 @@ class ImageSequence(TimelineMixin):
                 img_file = Path(img_file)
                 assert Path(img_file).exists(), f"{img_file} does not exist"
             elif isinstance(img_file, PILImage.Image):
-                self.images[i] = np.asarray(img_file.convert("RGBA"))
+                self.images[i] = _pil_to_rgba(img_file)
             elif isinstance(img_file, np.ndarray):
                 self.images[i] = img_file
             else:
                 raise ValueError(f"Invalid img_file type: {type(img_file)}")
+            image = self.images[i]
+            if premultiplied and image is not None:
+                self.images[i] = _premultiply(image)
+        self._premultiplied = premultiplied
+        self._each_duration: float | None = None
+        self._cache: OrderedDict[int, np.ndarray | _PalettedImage] = OrderedDict()
+        self._cache_bytes = 0
+        self._incompressible: set[int] = set()
+        self._futures: dict[int, Future[np.ndarray]] = {}
+        self._last_idx = -1
+        self._stride = 1
+        # Queued decodes would otherwise keep the shared workers busy after the layer is discarded.
+        weakref.finalize(self, _cancel_futures, self._futures)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_cache'] = OrderedDict()
+        state['_cache_bytes'] = 0
+        state['_futures'] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        weakref.finalize(self, _cancel_futures, self._futures)
+
+    def get_state(self, time: float) -> int:
+        """Returns the index of the image at the given time, or ``-1`` if no image exists."""
+        if self._each_duration is not None and math.isfinite(time):
+            # All images have the same duration, so the index can be computed directly.
+            idx = int(time // self._each_duration)
+            if 0 <= idx < len(self.start_times) and self.start_times[idx] <= time < self.end_times[idx]:
+                return idx
+        return super().get_state(time)
 
     def get_key(self, time: float) -> int:
         """Get the state index for the given time."""
-        idx = self.get_state(time)
-        if idx < 0:
-            return -1
-        return idx
+        return self.get_state(time)
+
+    def _prefetch(self, idx: int) -> None:
+        # Images are prefetched with the same stride as the requests, so skipped images are not decoded.
+        if 0 < idx - self._last_idx <= _MAX_PREFETCH_STRIDE:
+            self._stride = idx - self._last_idx
+        self._last_idx = idx
+        window = range(idx + self._stride, len(self.img_files), self._stride)[:_PREFETCH_FRAMES]
+        for i in list(self._futures):
+            if i not in window:
+                self._futures.pop(i).cancel()
+        for i in window:
+            if self.images[i] is not None or i in self._cache or i in self._futures:
+                continue
+            img_file = self.img_files[i]
+            assert isinstance(img_file, (str, PathLike))
+            self._futures[i] = _PREFETCH_EXECUTOR.submit(_read_image_file, img_file, self._premultiplied)
+
+    def _load_image(self, idx: int) -> np.ndarray:
+        entry = self._cache.get(idx)
+        if entry is not None:
+            self._cache.move_to_end(idx)
+            # Paletted images stay compressed in the cache, so they are not compressed again when they get cold.
+            return entry if isinstance(entry, np.ndarray) else entry.to_rgba()
+        future = self._futures.pop(idx, None)
+        if future is None:
+            img_file = self.img_files[idx]
+            assert isinstance(img_file, (str, PathLike))
+            image = _read_image_file(img_file, self._premultiplied)
+        else:
+            image = future.result()
+        self._set_cache(idx, image)
+        self._shrink_cache()
+        return image
+
+    def _set_cache(self, idx: int, entry: np.ndarray | _PalettedImage) -> None:
+        old_entry = self._cache.get(idx)
+        if old_entry is not None:
+            self._cache_bytes -= old_entry.nbytes
+        self._cache[idx] = entry
+        self._cache_bytes += entry.nbytes
+
+    def _shrink_cache(self) -> None:
+        if self._cache_bytes <= _CACHE_BYTES:
+            return
+        # Compress cold images with few colors first, starting from the least recently used one.
+        # Without Numba, finding the palette costs more than decoding the image again.
+        cold_items = list(self._cache.items())[:-_HOT_FRAMES] if numba_available else []
+        for idx, entry in cold_items:
+            if self._cache_bytes <= _CACHE_BYTES:
+                return
+            if not isinstance(entry, np.ndarray) or idx in self._incompressible:
+                continue
+            paletted = _PalettedImage.from_rgba(entry)
+            if paletted is None:
+                self._incompressible.add(idx)
+            else:
+                self._set_cache(idx, paletted)
+        while self._cache_bytes > _CACHE_BYTES and len(self._cache) > 1:
+            _, entry = self._cache.popitem(last=False)
+            self._cache_bytes -= entry.nbytes
 
     def __call__(self, time: float) -> np.ndarray | None:
         idx = self.get_state(time)
         if idx < 0:
             return None
-        if self.images[idx] is None:
-            img_file = self.img_files[idx]
-            assert isinstance(img_file, (str, PathLike))
-            image = np.asarray(PILImage.open(str(img_file)).convert("RGBA"))
-            self.images[idx] = image
-        return self.images[idx]
+        image = self.images[idx]
+        if image is None:
+            image = self._load_image(idx)
+        self._prefetch(idx)
+        return image
+
+
+def _open_av_container(video_file: Path, hwaccel: str | None) -> av.container.InputContainer:
+    if hwaccel is not None:
+        container = None
+        try:
+            from av.codec.hwaccel import HWAccel
+            container = av.open(str(video_file), hwaccel=HWAccel(hwaccel, allow_software_fallback=True))
+            container.streams.video[0].thread_type = "AUTO"
+            # The hardware device is created when the decoder is opened, so decode one frame to check it.
+            next(container.decode(video=0))
+            # With ``allow_software_fallback``, the codec silently decodes on the CPU if it cannot use the device.
+            if not container.streams.video[0].codec_context.is_hwaccel:
+                warnings.warn(
+                    f"Hardware decoding with {hwaccel} is not available. Falling back to software decoding.")
+            return container
+        except (ImportError, av.FFmpegError, StopIteration):
+            if container is not None:
+                container.close()
+            warnings.warn(f"Hardware decoding with {hwaccel} is not available. Falling back to software decoding.")
+    container = av.open(str(video_file))
+    container.streams.video[0].thread_type = "AUTO"
+    return container
+
+
+class _AVReader:
+    """Frame reader backed by PyAV.
+
+    Frames are decoded in-process. Random access seeks to the nearest preceding keyframe
+    and decodes forward to the requested frame instead of decoding from the head of the file.
+    The decoder is kept alive between calls, so requests slightly ahead of the last decoded frame
+    (the common case for sequential rendering) continue decoding without seeking.
+    An index without a frame of its own (e.g., on variable frame rate videos) shows the preceding frame.
+
+    The container is only accessed from a dedicated decoder thread. After a frame is returned,
+    the next frame is decoded in that thread while the caller composites the current one.
+    When frames are requested at a lower rate than the video's frame rate, the lookahead follows
+    the same stride, and the skipped frames are decoded but never converted to RGBA.
+
+    If ``hwaccel`` is given, frames are decoded on that hardware device and downloaded to system memory.
+    """
+
+    def __init__(self, video_file: Path, premultiplied: bool = False, hwaccel: str | None = None) -> None:
+        self._container = _open_av_container(video_file, hwaccel)
+        stream = self._container.streams.video[0]
+        self._stream = stream
+        rate = stream.average_rate or stream.guessed_rate
+        time_base = stream.time_base
+        assert rate is not None and time_base is not None
+        self.fps = float(rate)
+        self.size = (stream.codec_context.width, stream.codec_context.height)
+        if self._container.duration is not None:
+            self.duration = self._container.duration / av.time_base
+        else:
+            assert stream.duration is not None
+            self.duration = float(stream.duration * time_base)
+        self.n_frame = stream.frames if stream.frames > 0 else int(round(self.duration * self.fps))
+        self.has_audio = len(self._container.streams.audio) > 0
+        self._start_time = 0.0 if stream.start_time is None else float(stream.start_time * time_base)
+        self._time_base = time_base
+        self._premultiplied = premultiplied
+        self._decode_iter: Iterator[av.VideoFrame] | None = None
+        # The last decoded frame at or before the requested index, and its RGBA image once it is converted.
+        self._held_frame: av.VideoFrame | None = None
+        self._held_index = -1
+        self._held_image: np.ndarray | None = None
+        # The frame decoded after the held one, which is past the requested index.
+        self._next_frame: av.VideoFrame | None = None
+        self._next_index = -1
+        self._first_index = 0
+        # The index of the first frame past the end of the stream, which is known once decoding reaches it.
+        # The container duration often runs past the last frame (e.g., when the audio is longer than the video).
+        self._eof_index: int | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Future[np.ndarray | None] | None = None
+        self._pending_index = -1
+        self._stride = 1
+        self._last_index = -1
+        self._last_frame: np.ndarray | None = None
+
+    def _get_frame_index(self, frame: av.VideoFrame) -> int:
+        return int(round((frame.time - self._start_time) * self.fps))
+
+    def read(self, frame_index: int) -> np.ndarray | None:
+        if frame_index == self._last_index:
+            return self._last_frame
+        if frame_index < 0 or (self._eof_index is not None and frame_index >= self._eof_index):
+            return None
+        pending, self._pending = self._pending, None
+        if pending is not None and self._pending_index == frame_index:
+            image = pending.result()
+        else:
+            if pending is not None:
+                pending.cancel()
+            image = self._executor.submit(self._decode, frame_index).result()
+        if 0 < frame_index - self._last_index <= _GOP_LOOKAHEAD_FRAMES:
+            self._stride = frame_index - self._last_index
+        self._last_index, self._last_frame = frame_index, image
+        if image is not None:
+            self._pending_index = frame_index + self._stride
+            self._pending = self._executor.submit(self._decode, self._pending_index)
+        return image
+
+    def _decode(self, frame_index: int) -> np.ndarray | None:
+        # Indices before the first frame of the stream show the first frame.
+        frame_index = max(frame_index, self._first_index)
+        if self._held_frame is None or not (
+                self._held_index <= frame_index <= self._held_index + _GOP_LOOKAHEAD_FRAMES):
+            self._seek(frame_index)
+        self._decode_until(frame_index)
+        if self._held_frame is None or (self._eof_index is not None and frame_index >= self._eof_index):
+            return None
+        if self._held_image is None:
+            # ``to_ndarray`` returns a view of the RGBA frame buffer allocated by libswscale,
+            # which is already 64-byte aligned; it is copied only if its rows are padded.
+            image = _as_aligned_rgba(self._held_frame.to_ndarray(format="rgba"))
+            self._held_image = _premultiply(image) if self._premultiplied else image
+        return self._held_image
+
+    def _decode_until(self, frame_index: int) -> None:
+        """Decode forward until the next frame is past ``frame_index``, holding the last frame before it."""
+        if self._next_frame is not None:
+            if self._next_index > frame_index:
+                return
+            self._hold(self._next_index, self._next_frame)
+            self._next_frame = None
+        while self._decode_iter is not None:
+            frame = next(self._decode_iter, None)
+            if frame is None:
+                self._decode_iter = None
+                if self._held_frame is not None:
+                    # Frames were decoded up to the end of the stream, so no frame exists past the held one.
+                    eof_index = self._held_index + 1
+                    self._eof_index = eof_index if self._eof_index is None else min(self._eof_index, eof_index)
+                return
+            if frame.pts is None:
+                continue
+            index = self._get_frame_index(frame)
+            if index > frame_index:
+                # The frame is kept for later requests; skipped frames are never converted to RGBA.
+                self._next_frame, self._next_index = frame, index
+                return
+            self._hold(index, frame)
+
+    def _hold(self, index: int, frame: av.VideoFrame) -> None:
+        self._held_frame, self._held_index, self._held_image = frame, index, None
+
+    def _seek(self, frame_index: int) -> None:
+        # A backward seek may still land past the target (e.g., on MPEG-TS),
+        # so step back further until a frame at or before the target is decoded.
+        seek_index = frame_index
+        step = _GOP_LOOKAHEAD_FRAMES
+        while True:
+            seek_index = max(seek_index, 0)
+            target_pts = int((self._start_time + seek_index / self.fps) / self._time_base)
+            self._container.seek(target_pts, backward=True, any_frame=False, stream=self._stream)
+            self._decode_iter = self._container.decode(self._stream)
+            self._held_frame, self._held_image, self._next_frame = None, None, None
+            self._decode_until(frame_index)
+            if self._held_frame is not None:
+                return
+            if seek_index == 0:
+                if self._next_frame is not None:
+                    # The stream starts after the target, so its first frame is shown instead.
+                    self._first_index = self._next_index
+                    self._hold(self._next_index, self._next_frame)
+                    self._next_frame = None
+                return
+            seek_index -= step
+            step *= 2
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._pending.cancel()
+        self._executor.shutdown(wait=True)
+        self._container.close()
+
+
+class _FFmpegReader:
+    """Frame reader that pipes raw RGBA frames from an ffmpeg subprocess. It is used when PyAV is not available.
+
+    Random access restarts ffmpeg with ``-ss`` placed before ``-i``, so that ffmpeg seeks in the input
+    to the nearest keyframe instead of decoding from the head of the file.
+    Requests slightly ahead of the current position are served by the running process.
+    """
+
+    def __init__(self, video_file: Path, premultiplied: bool = False) -> None:
+        self._video_file = video_file
+        self._premultiplied = premultiplied
+        reader = imageio_ffmpeg.read_frames(str(video_file))
+        meta_data = next(reader)
+        reader.close()
+        self.fps = meta_data["fps"]
+        self.size = meta_data["size"]
+        self.duration = meta_data["duration"]
+        self.n_frame = int(round(self.duration * self.fps))
+        self.has_audio = "audio_codec" in meta_data
+        # Frames that are skipped over are read into this buffer to avoid allocating an array per frame.
+        self._skip_buffer = np.empty((self.size[1], self.size[0], 4), dtype=np.uint8)
+        self._proc: subprocess.Popen | None = None
+        self._finalizer: weakref.finalize | None = None
+        self._pos = -1
+        # The index of the first frame past the end of the stream, which is known once ffmpeg stops at it.
+        self._eof_index: int | None = None
+        self._last_index = -1
+        self._last_frame: np.ndarray | None = None
+
+    def read(self, frame_index: int) -> np.ndarray | None:
+        if frame_index == self._last_index:
+            return self._last_frame
+        if frame_index < 0 or (self._eof_index is not None and frame_index >= self._eof_index):
+            return None
+        if self._proc is None or not (self._pos < frame_index <= self._pos + _KEYFRAME_DIST_FRAMES):
+            self._start(frame_index)
+        while self._pos < frame_index - 1:
+            if self._read_frame(self._skip_buffer) is None:
+                return None
+        image = self._read_frame(_empty_aligned(self._skip_buffer.shape))
+        if image is not None and self._premultiplied:
+            image = _premultiply(image)
+        self._last_index, self._last_frame = frame_index, image
+        return image
+
+    def _start(self, frame_index: int) -> None:
+        self.close()
+        # Start half a frame early so that rounding errors never skip the requested frame.
+        start_time = max(0.0, (frame_index - 0.5) / self.fps)
+        cmd = [
+            imageio_ffmpeg.get_ffmpeg_exe(), "-nostdin", "-loglevel", "error",
+            "-ss", f"{start_time:.6f}", "-i", str(self._video_file),
+            "-an", "-sn", "-f", "rawvideo", "-pix_fmt", "rgba", "-"]
+        # Frames are read directly into numpy arrays, so Python-level buffering of the pipe is disabled.
+        self._proc = subprocess.Popen(
+            cmd, bufsize=0, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._finalizer = weakref.finalize(self, _kill_process, self._proc)
+        self._pos = frame_index - 1
+
+    def _read_frame(self, out: np.ndarray) -> np.ndarray | None:
+        assert self._proc is not None and self._proc.stdout is not None
+        # ``bufsize=0`` makes stdout a raw file object.
+        stdout = cast(io.RawIOBase, self._proc.stdout)
+        buf = out.data.cast("B")
+        n_read = 0
+        while n_read < len(buf):
+            n = stdout.readinto(buf[n_read:])
+            if not n:
+                self._eof_index = self._pos + 1 if self._eof_index is None else min(self._eof_index, self._pos + 1)
+                self.close()
+                return None
+            n_read += n
+        self._pos += 1
+        return out
+
+    def close(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()
+        self._proc = None
+        self._finalizer = None
 
 
 class Video:
     """Video layer to encapsulate various formats of video data.
 
+    .. note::
+        Frames are decoded with PyAV if it is installed. Otherwise, frames are piped from the ffmpeg binary
+        of imageio-ffmpeg, which needs to restart ffmpeg whenever frames are accessed out of order.
+
     Args:
         video_file:
             the source of the video data. It can be a file path (``str`` or ``Path``).
         audio:
             whether to include the audio layer. Default is ``True``.
+        premultiplied:
+            if ``True``, the color channels of each frame are multiplied by the alpha channel when it is decoded.
+            Note that movis itself composites images with straight (non-premultiplied) alpha. Default is ``False``.
+        hwaccel:
+            the hardware device type used to decode frames (e.g., ``"cuda"``, ``"videotoolbox"``, ``"vaapi"``).
+            Decoded frames are copied back to system memory. If the device is not available,
+            frames are decoded on the CPU with a warning. This requires PyAV 14 or later
+            and is ignored when frames are read with the ffmpeg binary. Default is ``None``.
     """
 
-    def __init__(self, video_file: str | PathLike, audio: bool = True) -> None:
+    def __init__(
+        self,
+        video_file: str | PathLike,
+        audio: bool = True,
+        premultiplied: bool = False,
+        hwaccel: str | None = None,
+    ) -> None:
         self.video_file = Path(video_file)
-        self._reader = imageio.get_reader(self.video_file)
-        meta_data = self._reader.get_meta_data()
-        self._fps = meta_data["fps"]
-        self._size = meta_data["size"]
-        self._n_frame = meta_data["nframes"]
-        self._duration = meta_data["duration"]
+        self._premultiplied = premultiplied
+        self._hwaccel = hwaccel
+        self._reader: _AVReader | _FFmpegReader | None = self._open_reader()
+        self._fps = self._reader.fps
+        self._size = self._reader.size
+        self._n_frame = self._reader.n_frame
+        self._duration = self._reader.duration
         self._audio = audio
         self._audio_layer = None
-        if audio and "audio_codec" in meta_data:
+        if audio and self._reader.has_audio:
             self._audio_layer = Audio(video_file)
 
+    def _open_reader(self) -> _AVReader | _FFmpegReader:
+        if av_available:
+            return _AVReader(self.video_file, self._premultiplied, self._hwaccel)
+        return _FFmpegReader(self.video_file, self._premultiplied)
+
     def __getstate__(self):
         state = self.__dict__.copy()
         state['_reader'] = None
         return state
 
+    def close(self) -> None:
+        """Release the decoder of the video and its background thread.
+
+        The video file is opened again if the layer is rendered after it is closed.
+        """
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self) -> "Video":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
     @property
     def fps(self) -> float:
         """The frame rate of the video."""
@@ -286,14 +995,9 @@ class Video:
 
     def __call__(self, time: float) -> np.ndarray | None:
         if self._reader is None:
-            self._reader = imageio.get_reader(self.video_file)
+            self._reader = self._open_reader()
         frame_index = int(time * self._fps)
-        try:
-            frame = self._reader.get_data(frame_index)
-        except IndexError:
-            return None
-        pil_frame = PILImage.fromarray(frame).convert("RGBA")
-        return np.asarray(pil_frame)
+        return self._reader.read(frame_index)
 
     def get_audio(self, start_time: float, end_time: float) -> np.ndarray | None:
         if self._audio and self._audio_layer is not None:
@@ -1,12 +1,243 @@
 from pathlib import Path
+import subprocess
 import tempfile
+import threading
+import warnings
 
+import imageio
+import imageio_ffmpeg
 import numpy as np
+import pytest
 import soundfile as sf
+from PIL import Image as PILImage
 
 import movis as mv
 
 
+def test_image_ndarray():
+    gray = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    for img in [gray, np.stack([gray] * 3, axis=-1)]:
+        layer = mv.layer.Image(img)
+        assert layer.size == (4, 3)
+        frame = layer(0.0)
+        assert frame.shape == (3, 4, 4)
+        assert np.all(frame[:, :, :3] == gray[:, :, None])
+        assert np.all(frame[:, :, 3] == 255)
+    rgba = np.full((3, 4, 4), 128, dtype=np.uint8)
+    assert np.all(mv.layer.Image(rgba)(0.0) == rgba)
+    assert mv.layer.Image(rgba, duration=1.0)(1.0) is None
+
+
+def test_image_aligned():
+    gray = np.arange(15, dtype=np.uint8).reshape(3, 5)
+    rgba = np.random.randint(0, 256, size=(3, 5, 4), dtype=np.uint8)
+    frames = [
+        mv.layer.Image(gray)(0.0),
+        mv.layer.Image(np.stack([gray] * 3, axis=-1))(0.0),
+        mv.layer.Image(rgba, premultiplied=True)(0.0),
+        mv.layer.media._premultiply(rgba[:, 1:]),
+    ]
+    for frame in frames:
+        assert frame.flags.c_contiguous
+        assert frame.ctypes.data % 64 == 0
+
+
+def test_image_pil():
+    rgba = np.random.randint(0, 256, size=(3, 4, 4), dtype=np.uint8)
+    for mode in ["RGBA", "RGB", "L", "P"]:
+        img = PILImage.fromarray(rgba).convert(mode)
+        frame = mv.layer.Image(img)(0.0)
+        assert np.all(frame == np.asarray(img.convert("RGBA")))
+
+
+def test_image_transparency_key():
+    gray = np.array([[0, 10, 0, 20]], dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode, transparency in [("RGB", (0, 0, 0)), ("L", 0)]:
+            temp_file = Path(temp_dir) / f"{mode}.png"
+            PILImage.fromarray(gray).convert(mode).save(temp_file, transparency=transparency)
+            with PILImage.open(temp_file) as img:
+                assert img.mode == mode
+                assert np.all(mv.layer.Image(img)(0.0)[:, :, 3] == [0, 255, 0, 255])
+            assert np.all(mv.layer.Image(temp_file)(0.0)[:, :, 3] == [0, 255, 0, 255])
+            frame = mv.layer.ImageSequence.from_files([temp_file])(0.0)
+            assert np.all(frame[:, :, 3] == [0, 255, 0, 255])
+
+
+@pytest.mark.parametrize("numba_available", [
+    pytest.param(
+        True, marks=pytest.mark.skipif(not mv.layer.media.numba_available, reason="Numba is not installed")),
+    False,
+])
+def test_image_premultiplied(monkeypatch, numba_available):
+    monkeypatch.setattr(mv.layer.media, "numba_available", numba_available)
+    rgba = np.array([[[255, 128, 0, 128], [10, 20, 30, 0], [10, 20, 30, 255]]], dtype=np.uint8)
+    frame = mv.layer.Image(rgba, premultiplied=True)(0.0)
+    assert np.all(frame == np.array([[[128, 64, 0, 128], [0, 0, 0, 0], [10, 20, 30, 255]]], dtype=np.uint8))
+    assert np.all(mv.layer.Image(rgba)(0.0) == rgba)
+
+
+def test_image_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_file = Path(temp_dir) / "test.png"
+        rgb = np.random.randint(0, 256, size=(3, 4, 3), dtype=np.uint8)
+        PILImage.fromarray(rgb).save(temp_file)
+        layer = mv.layer.Image(temp_file)
+        frame = layer(0.0)
+        assert frame.shape == (3, 4, 4)
+        assert np.all(frame[:, :, :3] == rgb)
+        assert np.all(frame[:, :, 3] == 255)
+        assert mv.layer.Image(temp_file)(0.0) is frame
+
+
+def test_image_large_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_file = Path(temp_dir) / "test.png"
+        rgba = np.zeros((1024, 1280, 4), dtype=np.uint8)
+        rgba[:, :, 1] = np.arange(1280) % 256
+        rgba[:, :, 3] = 255
+        PILImage.fromarray(rgba).save(temp_file)
+        layer = mv.layer.Image(temp_file)
+        assert layer.size == (1280, 1024)
+        assert np.all(layer(0.0) == rgba)
+
+
+@pytest.mark.skipif(mv.layer.media._turbo_jpeg is None, reason="libjpeg-turbo is not available")
+def test_image_file_turbojpeg():
+    rgb = np.random.randint(0, 256, size=(32, 48, 3), dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in ["RGB", "L", "CMYK"]:
+            # CMYK images are rejected by libjpeg-turbo and decoded by the fallback.
+            temp_file = Path(temp_dir) / f"{mode}.jpg"
+            PILImage.fromarray(rgb).convert(mode).save(temp_file)
+            with PILImage.open(temp_file) as expected:
+                assert np.all(mv.layer.Image(temp_file)(0.0) == np.asarray(expected.convert("RGBA")))
+
+
+@pytest.mark.skipif(not mv.layer.media.pyvips_available, reason="pyvips is not installed")
+def test_image_file_pyvips():
+    rgba = np.random.randint(0, 256, size=(5, 6, 4), dtype=np.uint8)
+    images = {f"{mode}.png": PILImage.fromarray(rgba).convert(mode) for mode in ["RGB", "RGBA", "L", "LA", "P"]}
+    images["I16.png"] = PILImage.fromarray(np.arange(30, dtype=np.uint16).reshape(5, 6) * 2000)
+    images["CMYK.tiff"] = PILImage.fromarray(rgba).convert("CMYK")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, img in images.items():
+            temp_file = Path(temp_dir) / name
+            img.save(temp_file)
+            with PILImage.open(temp_file) as expected:
+                assert np.all(mv.layer.Image(temp_file)(0.0) == np.asarray(expected.convert("RGBA")))
+
+
+def test_imagesequence_files():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        n_image = 40
+        for i in range(n_image):
+            PILImage.fromarray(np.full((3, 4, 3), i, dtype=np.uint8)).save(Path(temp_dir) / f"{i:03d}.png")
+        layer = mv.layer.ImageSequence.from_dir(temp_dir, each_duration=0.5)
+        assert layer.duration == n_image * 0.5
+        for i in list(range(n_image)) + [3, 30, 2, 39]:
+            frame = layer(i * 0.5 + 0.25)
+            assert frame.shape == (3, 4, 4)
+            assert np.all(frame[:, :, :3] == i)
+            assert np.all(frame[:, :, 3] == 255)
+        assert layer(-0.5) is None
+        assert layer(n_image * 0.5) is None
+
+
+def test_imagesequence_shared_threads():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(8):
+            PILImage.fromarray(np.full((3, 4, 3), i, dtype=np.uint8)).save(Path(temp_dir) / f"{i:03d}.png")
+        n_thread = threading.active_count()
+        layers = [mv.layer.ImageSequence.from_dir(temp_dir) for _ in range(20)]
+        for layer in layers:
+            assert np.all(layer(2.5)[:, :, 0] == 2)
+        assert threading.active_count() <= n_thread + 2
+
+
+def test_imagesequence_prefetch_stride(monkeypatch):
+    n_decode = 0
+    read_image_file = mv.layer.media._read_image_file
+
+    def count_read_image_file(*args):
+        nonlocal n_decode
+        n_decode += 1
+        return read_image_file(*args)
+
+    monkeypatch.setattr(mv.layer.media, "_read_image_file", count_read_image_file)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(40):
+            PILImage.fromarray(np.full((3, 4, 3), i, dtype=np.uint8)).save(Path(temp_dir) / f"{i:03d}.png")
+        layer = mv.layer.ImageSequence.from_dir(temp_dir)
+        # Nothing is decoded until the layer is rendered.
+        assert len(layer._futures) == 0
+        for i in range(0, 40, 2):
+            assert np.all(layer(i + 0.5)[:, :, 0] == i)
+        # Only the first window may include images that are skipped.
+        assert n_decode <= 20 + 4
+
+
+def test_imagesequence_cache_budget(monkeypatch):
+    monkeypatch.setattr(mv.layer.media, "_CACHE_BYTES", 4 * 32 * 32 * 4)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = []
+        for i in range(10):
+            if i % 2 == 0:
+                img = np.full((32, 32, 4), 255, dtype=np.uint8)
+                img[:, :16, :3] = i
+            else:
+                img = np.random.randint(0, 256, size=(32, 32, 4), dtype=np.uint8)
+            PILImage.fromarray(img).save(Path(temp_dir) / f"{i:03d}.png")
+            images.append(img)
+        layer = mv.layer.ImageSequence.from_dir(temp_dir)
+        for _ in range(2):
+            for i in list(range(10)) + [8, 0, 6, 2]:
+                assert np.all(layer(i + 0.5) == images[i])
+
+
+@pytest.mark.skipif(not mv.layer.media.numba_available, reason="Numba is not installed")
+def test_imagesequence_cache_palette(monkeypatch):
+    monkeypatch.setattr(mv.layer.media, "_CACHE_BYTES", 5 * 32 * 32 * 4)
+    n_compress = 0
+    from_rgba = mv.layer.media._PalettedImage.from_rgba
+
+    def count_from_rgba(image):
+        nonlocal n_compress
+        n_compress += 1
+        return from_rgba(image)
+
+    monkeypatch.setattr(mv.layer.media._PalettedImage, "from_rgba", count_from_rgba)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = []
+        for i in range(10):
+            img = np.full((32, 32, 4), 255, dtype=np.uint8)
+            img[:, :16, :3] = i
+            PILImage.fromarray(img).save(Path(temp_dir) / f"{i:03d}.png")
+            images.append(img)
+        layer = mv.layer.ImageSequence.from_dir(temp_dir)
+        for _ in range(3):
+            for i in range(10):
+                assert np.all(layer(i + 0.5) == images[i])
+        paletted = mv.layer.media._PalettedImage.from_rgba(images[1])
+        assert paletted is not None
+        assert paletted.to_rgba().ctypes.data % 64 == 0
+        # Each image is compressed once, and cached images that are used again stay compressed.
+        assert n_compress <= 10
+        assert len(layer._cache) == 10
+        assert layer._cache_bytes <= mv.layer.media._CACHE_BYTES
+
+
+def test_imagesequence_get_key():
+    images = [np.zeros((3, 4, 4), dtype=np.uint8)] * 10
+    layer = mv.layer.ImageSequence.from_files(images, each_duration=0.1)
+    start_times = np.arange(10) * 0.1
+    layer_ref = mv.layer.ImageSequence(start_times, start_times + 0.1, images)
+    for t in np.concatenate([np.linspace(-0.5, 1.5, 201), start_times, start_times + 0.1]):
+        assert layer.get_key(t) == layer_ref.get_key(t)
+    assert layer.get_key(float("nan")) == -1
+    assert mv.layer.ImageSequence.from_files(images, each_duration=0.0).get_key(0.0) == -1
+
+
 def test_audio_ndarray():
     duration = 1
     audio = np.ones((2, duration * mv.AUDIO_SAMPLING_RATE), dtype=np.float32)
@@ -123,3 +354,103 @@ def test_audiosequence_files():
         assert layer.duration == 2.0
         audio = layer.get_audio(0.0, 2.0)
         assert audio.shape == (2, 2 * mv.AUDIO_SAMPLING_RATE)
+
+
+def write_test_video(file_name: str, n_frame: int = 30, fps: float = 10.0):
+    writer = imageio.get_writer(
+        file_name, fps=fps, codec="libx264", pixelformat="yuv444p",
+        macro_block_size=None, ffmpeg_log_level="error", output_params=["-g", "8"])
+    for i in range(n_frame):
+        writer.append_data(np.full((32, 48, 3), 8 * i, dtype=np.uint8))
+    writer.close()
+
+
+def convert_test_video(src_file: str, dst_file: str, *args: str):
+    cmd = [imageio_ffmpeg.get_ffmpeg_exe(), "-nostdin", "-loglevel", "error", "-i", src_file, *args, dst_file]
+    subprocess.run(cmd, check=True)
+
+
+@pytest.mark.parametrize("suffix", [".mp4", ".ts"])
+@pytest.mark.parametrize("av_available", [
+    pytest.param(
+        True, marks=pytest.mark.skipif(not mv.layer.media.av_available, reason="PyAV is not installed")),
+    False,
+])
+def test_video(monkeypatch, av_available, suffix):
+    monkeypatch.setattr(mv.layer.media, "av_available", av_available)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_file = str(Path(temp_dir) / "test.mp4")
+        write_test_video(temp_file)
+        if suffix != ".mp4":
+            # Seeking in MPEG-TS may land past the requested frame.
+            temp_file, src_file = str(Path(temp_dir) / f"test{suffix}"), temp_file
+            convert_test_video(src_file, temp_file, "-c", "copy")
+
+        layer = mv.layer.Video(temp_file)
+        assert layer.fps == 10.0
+        assert layer.size == (48, 32)
+        assert layer.duration == pytest.approx(3.0, abs=0.1)
+        for t in [0.0, 0.1, 0.2, 2.5, 0.3, 1.7, 1.2, 2.9]:
+            frame = layer(t)
+            assert frame.shape == (32, 48, 4)
+            assert frame.dtype == np.uint8
+            assert frame.ctypes.data % 64 == 0
+            assert np.all(np.abs(frame[:, :, 0].astype(int) - 8 * int(t * 10)) <= 2)
+            assert np.all(frame[:, :, 3] == 255)
+        assert layer(5.0) is None
+        assert layer(4.0) is None
+        assert np.all(np.abs(layer(2.8)[:, :, 0].astype(int) - 8 * 28) <= 2)
+
+        layer = mv.layer.Video(temp_file)
+        for i in range(30):
+            frame = layer(i / 10 + 0.01)
+            assert np.all(np.abs(frame[:, :, 0].astype(int) - 8 * i) <= 2)
+
+        layer = mv.layer.Video(temp_file)
+        for i in range(0, 30, 3):
+            frame = layer(i / 10 + 0.01)
+            assert np.all(np.abs(frame[:, :, 0].astype(int) - 8 * i) <= 2)
+        layer.close()
+        assert np.all(np.abs(layer(1.2)[:, :, 0].astype(int) - 8 * 12) <= 2)
+
+        n_thread = threading.active_count()
+        for _ in range(5):
+            with mv.layer.Video(temp_file) as layer:
+                layer(0.5)
+        assert threading.active_count() <= n_thread
+
+
+@pytest.mark.parametrize("av_available", [
+    pytest.param(
+        True, marks=pytest.mark.skipif(not mv.layer.media.av_available, reason="PyAV is not installed")),
+    False,
+])
+def test_video_vfr(monkeypatch, av_available):
+    monkeypatch.setattr(mv.layer.media, "av_available", av_available)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        src_file = str(Path(temp_dir) / "src.mp4")
+        write_test_video(src_file)
+        temp_file = str(Path(temp_dir) / "test.mp4")
+        # Frames 10 to 19 are dropped, and frame 9 is shown until frame 20 starts.
+        convert_test_video(
+            src_file, temp_file, "-vf", "select='not(between(n,10,19))'", "-fps_mode", "vfr",
+            "-c:v", "libx264", "-pix_fmt", "yuv444p")
+        layer = mv.layer.Video(temp_file)
+        for t in [1.2, 1.5, 1.8]:
+            assert np.all(np.abs(layer(t)[:, :, 0].astype(int) - 8 * 9) <= 2)
+
+
+@pytest.mark.skipif(not mv.layer.media.av_available, reason="PyAV is not installed")
+def test_video_hwaccel():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_file = str(Path(temp_dir) / "test.mp4")
+        write_test_video(temp_file)
+
+        with warnings.catch_warnings():
+            # A warning is emitted when the device is not available.
+            warnings.simplefilter("ignore", category=UserWarning)
+            layer = mv.layer.Video(temp_file, hwaccel="cuda")
+        for t in [0.0, 0.1, 2.5, 1.2]:
+            frame = layer(t)
+            assert frame.shape == (32, 48, 4)
+            assert np.all(np.abs(frame[:, :, 0].astype(int) - 8 * int(t * 10)) <= 2)